@@ -1,6 +1,57 @@
 import os
 import re
 import ast
+from typing import NamedTuple, Optional
+
+_RE_TODO = re.compile(rb'# ?todo', re.IGNORECASE)
+
+# builtins whose call in a default argument creates a mutable value
+_MUT_BUILTINS = frozenset({'set', 'list', 'dict'})
+
+_SNAKE_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_')
+
+
+def _is_snake(name: str) -> bool:
+    # up to two leading and two trailing underscores are allowed (_private, __dunder__)
+    start = len(name) - len(name.lstrip('_'))
+    end = len(name.rstrip('_'))
+    if start > 2 or len(name) - end > 2:
+        return False
+    body = name[start:end]
+    # the remaining part must start with a lowercase letter
+    if not body or not 'a' <= body[0] <= 'z':
+        return False
+    previous = ''
+    for c in body:
+        if c not in _SNAKE_CHARS or c == previous == '_':
+            return False
+        previous = c
+    return True
+
+
+def _definition_name(definition: bytes) -> str:
+    # the word after 'class'/'def', up to the parameter list or the colon
+    parts = definition.split(maxsplit=1)
+    if len(parts) < 2:
+        return ''
+    name = parts[1]
+    for i, c in enumerate(name):
+        if c in b'(: ':
+            name = name[:i]
+            break
+    # only the name of a definition line is decoded
+    return name.decode('utf-8', 'replace')
+
+
+class LineFacts(NamedTuple):
+    line: bytes  # the right-stripped line
+    definition: bytes  # the line from its class/def keyword on, empty for other lines
+    indent: int  # number of leading spaces
+    hash_index: int  # position of the first '#', -1 if there is none
+    code: bytes  # everything before the first '#'
+    comment: bytes  # everything from the first '#' on
+    kind: Optional[str]  # 'class' or 'def' when the line opens a definition, None otherwise
+    name: str  # the defined class or function name, empty for other lines
 
 
 class Checker:
@@ -18,178 +69,174 @@ class Checker:
         "S011": "Variable var_name should be written in snake_case",
         "S012": "The default argument value is mutable"
     }
+    # "S001 Too long\n" etc., S007-S009 still need their name filled in with format
+    SUFFIXES = {code: f"{code} {message}\n" for code, message in MESSAGE_CODES.items()}
+
+    @staticmethod
+    def scan_line(line: bytes) -> LineFacts:
+        # derive everything the line rules need in one go
+        # S002 counts spaces only, the definition gate skips any leading whitespace
+        indent = len(line) - len(line.lstrip(b' '))
+        hash_index = line.find(b'#')
+        if hash_index < 0:
+            code, comment = line, b''
+        else:
+            code, comment = line[:hash_index], line[hash_index:]
+        definition = line.lstrip()
+        if definition.startswith(b'async '):
+            definition = definition[6:].lstrip()
+        kind = 'class' if definition.startswith(b'class ') else 'def' if definition.startswith(b'def ') else None
+        if kind is None:
+            definition = b''
+        name = _definition_name(definition) if kind else ''
+        return LineFacts(line, definition, indent, hash_index, code, comment, kind, name)
 
     @staticmethod
     # S001
-    def check_length(line: str) -> bool:
-        return len(line) > 79
+    def check_length(facts: LineFacts) -> bool:
+        # a line is never shorter in bytes than in characters, so only long lines are decoded
+        return len(facts.line) > 79 and len(facts.line.decode('utf-8', 'replace')) > 79
 
     @staticmethod
     # S002
-    def check_indentation(line: str) -> bool:
-        t = 0
-        for c in line:
-            if c == " ":
-                t += 1
-            else:
-                break
-        return t % 4 != 0
+    def check_indentation(facts: LineFacts) -> bool:
+        return facts.indent % 4 != 0
 
     @staticmethod
     # S003
-    def check_semicolons(line: str) -> bool:
-        code = line.split("#")[0]
-        if len(code) > 0:
-            return code.strip()[-1] == ";"
+    def check_semicolons(facts: LineFacts) -> bool:
+        # indented comment lines leave only whitespace before the '#'
+        code = facts.code.rstrip()
+        if not code:
+            return False
+        return code.endswith(b";")
 
     @staticmethod
     # S004
-    def check_inline_comments(line: str) -> bool:
-        return "  #" not in line and "#" in line and line[0] != "#"
+    def check_inline_comments(facts: LineFacts) -> bool:
+        return facts.hash_index > 0 and b"  #" not in facts.line
 
     @staticmethod
     # S005
-    def check_todos(line: str) -> bool:
-        line = line.casefold()
-        return any(("#todo" in line, "# todo" in line))
+    def check_todos(facts: LineFacts) -> bool:
+        return facts.hash_index >= 0 and _RE_TODO.search(facts.comment) is not None
 
     @staticmethod
     # S006
     def check_blank_lines(lines: list, i: int) -> bool:
         if i > 2:
-            return lines[i - 3: i] == ["", "", ""] and lines[i] != ""
+            return lines[i - 3: i] == [b"", b"", b""] and lines[i] != b""
 
     @staticmethod
     # S007
-    def check_spaces(line: str) -> bool:
-        return ('class' in line or 'def' in line) and (re.match(r'(class|def)\s{2,}', line.lstrip()))
+    def check_spaces(facts: LineFacts) -> bool:
+        return facts.kind is not None and facts.definition.startswith((b'class  ', b'def  '))
 
     @staticmethod
     # S008
-    def check_class_name(line: str) -> bool:
-        return 'class' in line and not re.match(r'^class\s+[A-Z]', line)
+    def check_class_name(facts: LineFacts) -> bool:
+        return facts.kind == 'class' and not 'A' <= facts.name[:1] <= 'Z'
 
     @staticmethod
     # S009
-    def check_func_name(line: str) -> bool:
-        return 'def' in line and not re.match(r'^def\s+[^A-Z]', line.lstrip())
+    def check_func_name(facts: LineFacts) -> bool:
+        return facts.kind == 'def' and 'A' <= facts.name[:1] <= 'Z'
 
     @staticmethod
-    # S010
-    def check_argument_name(objects: dict) -> set:
-        # parse functions appended to the dictionary
-        functions = objects[ast.FunctionDef]
-        warnings = set()
-        for f in functions:
+    # S010, S011, S012
+    def check_ast_rules(objects: dict) -> tuple:
+        arg_warnings = set()
+        variable_warnings = set()
+        mutable_warnings = set()
+        # parse functions appended to the dictionary, arguments and defaults in the same loop
+        for f in objects[ast.FunctionDef]:
             for a in f.args.args:
                 # verify snake_case
-                if re.match("(_{,2})?[a-z]+(_[a-z]*)*(_{,2})?", a.arg) is None:
-                    # append if not
-                    warnings.add(a.arg)
-        return warnings
-
-    @staticmethod
-    # S011
-    def check_variable_name(objects: dict) -> set:
+                if not _is_snake(a.arg):
+                    arg_warnings.add((a.lineno, a.arg))
+            # verify mutable default arguments
+            for def_arg in f.args.defaults:
+                if isinstance(def_arg, (ast.List, ast.Set, ast.Dict)):
+                    mutable_warnings.add((f.lineno, f.name))
+                # calls such as os.getcwd() have an ast.Attribute func without an id
+                elif (isinstance(def_arg, ast.Call) and isinstance(def_arg.func, ast.Name)
+                      and def_arg.func.id in _MUT_BUILTINS):
+                    mutable_warnings.add((f.lineno, f.name))
         # parse variables appended to the dictionary
-        variables = objects[ast.Name]
-        warnings = set()
-        for v in variables:
+        for v in objects[ast.Name]:
             if isinstance(v.ctx, ast.Store):
                 # verify snake_case
-                if re.match("(_{,2})?[a-z]+(_[a-z]*)*(_{,2})?", v.id) is None:
-                    # append if not
-                    warnings.add(v.id)
-        return warnings
-
-    @staticmethod
-    # S012
-    def check_mutable_value(objects: dict) -> set:
-        # verify mutable default arguments
-        functions = objects[ast.FunctionDef]
-        warnings = set()
-        for f in functions:
-            for def_arg in f.args.defaults:
-                if type(def_arg) in (ast.List, ast.Set, ast.Dict):
-                    warnings.add(f.name)
-                elif type(def_arg) == ast.Call:
-                    if def_arg.func.id in ('set', 'list', 'dict'):
-                        warnings.add(f)
-        return warnings
+                if not _is_snake(v.id):
+                    variable_warnings.add((v.lineno, v.id))
+        return arg_warnings, variable_warnings, mutable_warnings
 
     @staticmethod
-    def ast_processing(f) -> dict:
+    def ast_processing(source: bytes) -> dict:
         objects = {ast.FunctionDef: [],
                    ast.Name: []}
-        tree = ast.parse(f.read())
-        nodes = ast.walk(tree)
+        # exact node type -> list append, one dict lookup per node
+        dispatch = {node_type: nodes.append for node_type, nodes in objects.items()}
+        tree = ast.parse(source)
 
         # append to dictionary nodes in respective instances
-        for n in nodes:
-            if isinstance(n, ast.FunctionDef):
-                objects[ast.FunctionDef].append(n)
-            if isinstance(n, ast.Name):
-                objects[ast.Name].append(n)
+        for n in ast.walk(tree):
+            append = dispatch.get(type(n))
+            if append:
+                append(n)
         return objects
 
     @staticmethod
-    def test(path, file=None):
+    def test(path, file=None) -> str:
         if file:
             path = os.path.join(path, file)
-        with open(path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            # creates a list of lines on which the stripping function has been applied
-            lines = list(map(lambda x: x.rstrip(), lines))
-            # change the position of the file handler at the beginning of the file
-            f.seek(0)
-            objects = Checker.ast_processing(f)
-            checked_args = list(Checker.check_argument_name(objects))
-            checked_variables = list(Checker.check_variable_name(objects))
-            checked_default_variables = list(Checker.check_mutable_value(objects))
-
-            for i in range(len(lines)):
-                if Checker.check_length(lines[i]):
-                    print(f"{path}: Line {i + 1}: S001 {Checker.MESSAGE_CODES['S001']}")
-                if Checker.check_indentation(lines[i]):
-                    print(f"{path}: Line {i + 1}: S002 {Checker.MESSAGE_CODES['S002']}")
-                if Checker.check_semicolons(lines[i]):
-                    print(f"{path}: Line {i + 1}: S003 {Checker.MESSAGE_CODES['S003']}")
-                if Checker.check_inline_comments(lines[i]):
-                    print(f"{path}: Line {i + 1}: S004 {Checker.MESSAGE_CODES['S004']}")
-                if Checker.check_todos(lines[i]):
-                    print(f"{path}: Line {i + 1}: S005 {Checker.MESSAGE_CODES['S005']}")
-                if Checker.check_blank_lines(lines, i):
-                    print(f"{path}: Line {i + 1}: S006 {Checker.MESSAGE_CODES['S006']}")
-                if Checker.check_spaces(lines[i]):
-                    constructor = "'class'" if lines[i].startswith("class") else "'def'"
-                    print(f"{path}: Line {i + 1}: S007 {Checker.MESSAGE_CODES['S007'].format(constructor)}")
-                if Checker.check_class_name(lines[i]):
-                    class_name = re.split(' +', lines[i])[1]
-                    class_name = re.sub(r'\W+', '', class_name)
-                    print(f"{path}: Line {i + 1}: S008 {Checker.MESSAGE_CODES['S008'].format(class_name)}")
-                if Checker.check_func_name(lines[i]):
-                    function_name = re.split(' +', lines[i])[1]
-                    function_name = re.sub(r'\W+', '', function_name)
-                    print(f"{path}: Line {i + 1}: S009 {Checker.MESSAGE_CODES['S009'].format(function_name)}")
-
-                j = 0
-                while j < len(checked_args):
-                    if checked_args[j] in lines[i]:
-                        print(f"{path}: Line {i + 1}: S010 {Checker.MESSAGE_CODES['S010']}")
-                        checked_args.remove(checked_args[j])
-                    else:
-                        j += 1
-                j = 0
-                while j < len(checked_variables):
-                    if checked_variables[j] in lines[i]:
-                        print(f"{path}: Line {i + 1}: S011 {Checker.MESSAGE_CODES['S011']}")
-                        checked_variables.remove(checked_variables[j])
-                    else:
-                        j += 1
-                j = 0
-                while j < len(checked_default_variables):
-                    if checked_default_variables[j] in lines[i]:
-                        print(f"{path}: Line {i + 1}: S012 {Checker.MESSAGE_CODES['S012']}")
-                        checked_default_variables.remove(checked_default_variables[j])
-                    else:
-                        j += 1
+        with open(path, 'rb') as f:
+            source = f.read()
+        objects = Checker.ast_processing(source)
+        # the same buffer feeds both the line rules and the AST
+        lines = [line.rstrip() for line in source.splitlines()]
+        # line numbers reported by the AST rules
+        arg_warnings, variable_warnings, mutable_warnings = Checker.check_ast_rules(objects)
+        arg_lines = {lineno for lineno, _ in arg_warnings}
+        variable_lines = {lineno for lineno, _ in variable_warnings}
+        mutable_lines = {lineno for lineno, _ in mutable_warnings}
+
+        # warnings are collected and returned as a single string
+        out = []
+        prefix = f"{path}: Line "
+        for i in range(len(lines)):
+            # no rule can fire on a blank line, S006 is reported on the next non-empty one
+            if not lines[i]:
+                continue
+            facts = Checker.scan_line(lines[i])
+            start = len(out)
+            if Checker.check_length(facts):
+                out.append(Checker.SUFFIXES['S001'])
+            if Checker.check_indentation(facts):
+                out.append(Checker.SUFFIXES['S002'])
+            if Checker.check_semicolons(facts):
+                out.append(Checker.SUFFIXES['S003'])
+            if Checker.check_inline_comments(facts):
+                out.append(Checker.SUFFIXES['S004'])
+            if Checker.check_todos(facts):
+                out.append(Checker.SUFFIXES['S005'])
+            if Checker.check_blank_lines(lines, i):
+                out.append(Checker.SUFFIXES['S006'])
+            if Checker.check_spaces(facts):
+                out.append(Checker.SUFFIXES['S007'].format(f"'{facts.kind}'"))
+            if Checker.check_class_name(facts):
+                out.append(Checker.SUFFIXES['S008'].format(facts.name))
+            if Checker.check_func_name(facts):
+                out.append(Checker.SUFFIXES['S009'].format(facts.name))
+            if i + 1 in arg_lines:
+                out.append(Checker.SUFFIXES['S010'])
+            if i + 1 in variable_lines:
+                out.append(Checker.SUFFIXES['S011'])
+            if i + 1 in mutable_lines:
+                out.append(Checker.SUFFIXES['S012'])
+            # the line number is only formatted for lines with warnings
+            if len(out) > start:
+                line_prefix = f"{prefix}{i + 1}: "
+                for j in range(start, len(out)):
+                    out[j] = line_prefix + out[j]
+
+        return ''.join(out)
@@ -0,0 +1,10 @@
+def scale(fooBar):
+    return fooBar
+
+
+def shift(foo__bar):
+    return foo__bar
+
+
+def keep(value_2, __private):
+    return value_2, __private
@@ -0,0 +1,3 @@
+def describe(value):
+    # an indented comment line;
+    return value  # a comment after the code;
@@ -0,0 +1,9 @@
+import os
+
+
+def get_path(path=os.getcwd()):
+    return path
+
+
+def get_items(cwd=os.getcwd(), items=list()):
+    return items
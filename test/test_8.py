@@ -0,0 +1,8 @@
+items = [(1, 2), (3, 4)]
+total = [BadComp for BadComp, other in items]
+if (BadWalrus := len(items)):
+    pairs = {K: v for K, v in items}
+
+
+def count(values):
+    return sum(1 for Inner in values)
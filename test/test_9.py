@@ -0,0 +1,23 @@
+class Outer:
+    class inner:
+        pass
+
+    def Method(self):
+        pass
+
+
+def classify(value):
+    # this class of values needs no definition
+    return value
+
+
+async def Fetch():
+    pass
+
+
+class Tabbed:
+	def Method(self):
+		pass
+
+	def  spaced(self):
+		pass
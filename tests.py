@@ -51,7 +51,12 @@ class AnalyzerTest(StageTest):
                 TestCase(args=[f"test{os.sep}this_stage{os.sep}test_3.py"], check_function=self.test_3),
                 TestCase(args=[f"test{os.sep}this_stage{os.sep}test_4.py"], check_function=self.test_4),
                 TestCase(args=[f"test{os.sep}this_stage{os.sep}test_5.py"], check_function=self.test_5),
-                TestCase(args=[cur_dir + f"{os.sep}test{os.sep}this_stage"], check_function=self.test_common)]
+                TestCase(args=[cur_dir + f"{os.sep}test{os.sep}this_stage"], check_function=self.test_common),
+                TestCase(args=[f"test{os.sep}test_6.py"], check_function=self.test_6),
+                TestCase(args=[f"test{os.sep}test_7.py"], check_function=self.test_7),
+                TestCase(args=[f"test{os.sep}test_8.py"], check_function=self.test_8),
+                TestCase(args=[f"test{os.sep}test_9.py"], check_function=self.test_9),
+                TestCase(args=[f"test{os.sep}test_10.py"], check_function=self.test_10)]
 
     # Stages 1-2 tests
     def test_1(self, output: str, attach):
@@ -232,6 +237,106 @@ class AnalyzerTest(StageTest):
 
         return CheckResult.correct()
 
+    # Indented comment lines
+    def test_6(self, output, attach):
+        output = output.strip().lower().splitlines()
+
+        if output:
+            return CheckResult.wrong(FALSE_ALARM + "Semicolons and comments in indented comment lines are correct. ")
+
+        return CheckResult.correct()
+
+    # Mutable default argument next to a call on a module attribute
+    def test_7(self, output, attach):
+        file_path = f"test{os.sep}test_7.py"
+        output = output.strip().lower().splitlines()
+
+        if not output:
+            return CheckResult.wrong("It looks like there is no messages from your program.")
+
+        for issue in output:
+            if issue.startswith(f"{file_path}: line 4: "):
+                return CheckResult.wrong(FALSE_ALARM + "A call on a module attribute is not a mutable value. ")
+
+        if not len(output) == 1:
+            return CheckResult.wrong("A wrong number of warning messages. "
+                                     "Your program should warn about one mistake in this test case")
+
+        if not output[0].startswith(f"{file_path}: line 8: {error_code_default_argument_is_mutable}"):
+            return CheckResult.wrong(MUTABLE_ARG)
+
+        return CheckResult.correct()
+
+    # Variables bound by comprehensions and assignment expressions
+    def test_8(self, output, attach):
+        file_path = f"test{os.sep}test_8.py"
+        output = output.strip().lower().splitlines()
+
+        if not output:
+            return CheckResult.wrong("It looks like there is no messages from your program.")
+
+        for issue in output:
+            if issue.startswith(f"{file_path}: line 1: ") or issue.startswith(f"{file_path}: line 7: "):
+                return CheckResult.wrong(FALSE_ALARM)
+
+        if not len(output) == 4:
+            return CheckResult.wrong("Incorrect number of warning messages. "
+                                     "Your program should warn about four mistakes in this test case.")
+        for i, j in enumerate([2, 3, 4, 8]):
+            if not output[i].startswith(f"{file_path}: line {j}: {error_code_var_func_name}"):
+                return CheckResult.wrong(VAR_FUNC_NAME)
+
+        return CheckResult.correct()
+
+    # Nested, tab-indented and async definitions
+    def test_9(self, output, attach):
+        file_path = f"test{os.sep}test_9.py"
+        output = output.strip().lower().splitlines()
+
+        if not output:
+            return CheckResult.wrong("It looks like there is no messages from your program.")
+
+        for issue in output:
+            if issue.startswith(f"{file_path}: line 9: ") or issue.startswith(f"{file_path}: line 10: "):
+                return CheckResult.wrong(FALSE_ALARM + "The line only mentions the word 'class'. ")
+
+        if not len(output) == 5:
+            return CheckResult.wrong("A wrong number of warning messages. "
+                                     "Your program should warn about five mistakes in this test case")
+        if not output[0].startswith(f"{file_path}: line 2: {error_code_class_name}") or "inner" not in output[0]:
+            return CheckResult.wrong(CLASS_NAME)
+        if not output[1].startswith(f"{file_path}: line 5: {error_code_func_name}") or "method" not in output[1]:
+            return CheckResult.wrong(FUNC_NAME)
+        if not output[2].startswith(f"{file_path}: line 14: {error_code_func_name}") or "fetch" not in output[2]:
+            return CheckResult.wrong(FUNC_NAME + "Coroutines defined with 'async def' are functions too. ")
+        if not output[3].startswith(f"{file_path}: line 19: {error_code_func_name}"):
+            return CheckResult.wrong(FUNC_NAME + "The definition is indented with a tab. ")
+        if not output[4].startswith(f"{file_path}: line 22: {error_code_class_def_spaces}"):
+            return CheckResult.wrong(SPACES_AFTER_CLASS_FUNC + "The definition is indented with a tab. ")
+
+        return CheckResult.correct()
+
+    # Mixed case and double underscores inside argument names
+    def test_10(self, output, attach):
+        file_path = f"test{os.sep}test_10.py"
+        output = output.strip().lower().splitlines()
+
+        if not output:
+            return CheckResult.wrong("It looks like there is no messages from your program.")
+
+        for issue in output:
+            if issue.startswith(f"{file_path}: line 9: "):
+                return CheckResult.wrong(FALSE_ALARM + "Digits and leading underscores are allowed in snake_case. ")
+
+        if not len(output) == 2:
+            return CheckResult.wrong("A wrong number of warning messages. "
+                                     "Your program should warn about two mistakes in this test case")
+        for i, j in enumerate([1, 5]):
+            if not output[i].startswith(f"{file_path}: line {j}: {error_code_arg_name}"):
+                return CheckResult.wrong(ARG_NAME)
+
+        return CheckResult.correct()
+
 
 if __name__ == '__main__':
     AnalyzerTest("analyzer.code_analyzer").run_tests()